@@ -1,4 +1,6 @@
-from collections import Counter
+import os
+import tempfile
+from itertools import islice
 
 import numpy as np
 
@@ -13,12 +15,206 @@ def part_one(column_one, column_two) -> int:
 
     return total_difference
 
-def part_two(column_one, column_two) -> int:
-    count_map = Counter(column_two)
-
-    multiplied_results = {num: num * count_map.get(num, 0) for num in column_one}
+def write_sorted_runs(file_path: str, run_dir: str, run_size: int = 1_000_000) -> tuple:
+    """
+    Split the input into runs of at most run_size lines, sort each column of
+    every run in memory and spill it to run_dir as a .npy file.
+    Returns the run paths for the first and the second column.
+    """
+    first_runs, second_runs = [], []
+    with open(file_path, "r") as file:
+        while True:
+            lines = list(islice(file, run_size))
+            if not lines:
+                break
+            values = np.fromiter(map(int, "".join(lines).split()), dtype=np.int64).reshape(-1, 2)
+            for column, runs in ((0, first_runs), (1, second_runs)):
+                run_path = os.path.join(run_dir, f"col{column}_run{len(runs)}.npy")
+                np.save(run_path, np.sort(values[:, column]))
+                runs.append(run_path)
+    return first_runs, second_runs
+
+def merge_sorted_runs(run_paths: list, chunk_size: int = 1_000_000, max_fan_in: int = 16):
+    """
+    K-way merge of sorted .npy runs, yielding sorted chunks of at most about chunk_size.
+    Each run gets a window of chunk_size // K values, so the buffers together hold
+    about chunk_size values whatever K is. When there are more than max_fan_in runs,
+    groups of them are first merged into longer runs on disk so the windows never
+    shrink below chunk_size // max_fan_in.
+    """
+    while len(run_paths) > max_fan_in:
+        run_paths = [merge_to_run(run_paths[i:i + max_fan_in], chunk_size)
+                     for i in range(0, len(run_paths), max_fan_in)]
+
+    runs = [np.load(path, mmap_mode="r") for path in run_paths]
+    window = max(1, chunk_size // max(len(runs), 1))
+    offsets = [0] * len(runs)
+    buffers = [np.array(run[:window]) for run in runs]
+
+    while True:
+        active = [i for i, buffer in enumerate(buffers) if len(buffer)]
+        if not active:
+            return
+
+        # Everything up to the smallest buffer tail is safe to emit:
+        # no run can produce a smaller value after its current window.
+        cutoff = min(buffers[i][-1] for i in active)
+        pieces = []
+        for i in active:
+            split = np.searchsorted(buffers[i], cutoff, side="right")
+            pieces.append(buffers[i][:split])
+            buffers[i] = buffers[i][split:]
+            if not len(buffers[i]):
+                offsets[i] += window
+                buffers[i] = np.array(runs[i][offsets[i]:offsets[i] + window])
+
+        yield np.sort(np.concatenate(pieces), kind="mergesort")
+
+def merge_to_run(run_paths: list, chunk_size: int) -> str:
+    """Merge a group of runs into one new run next to them, writing it chunk by chunk."""
+    length = sum(len(np.load(path, mmap_mode="r")) for path in run_paths)
+    root, _ = os.path.splitext(run_paths[0])
+    merged_path = f"{root}_merged{len(run_paths)}.npy"
+
+    merged = np.lib.format.open_memmap(merged_path, mode="w+", dtype=np.int64, shape=(length,))
+    position = 0
+    for chunk in merge_sorted_runs(run_paths, chunk_size):
+        merged[position:position + len(chunk)] = chunk
+        position += len(chunk)
+    merged.flush()
+    del merged
+
+    for path in run_paths:
+        os.remove(path)
+    return merged_path
+
+def rechunk(chunks, chunk_size: int):
+    """Re-slice a stream of arrays into arrays of exactly chunk_size (the last may be shorter)."""
+    pending = np.empty(0, dtype=np.int64)
+    for chunk in chunks:
+        pending = np.concatenate((pending, chunk))
+        while len(pending) >= chunk_size:
+            yield pending[:chunk_size]
+            pending = pending[chunk_size:]
+    if len(pending):
+        yield pending
+
+def part_one_out_of_core(file_path: str, run_size: int = 1_000_000, chunk_size: int = 1_000_000) -> int:
+    """
+    Same answer as part_one, but computed from disk-backed sorted runs so
+    memory stays bounded by run_size and chunk_size instead of the input size.
+    """
+    with tempfile.TemporaryDirectory() as run_dir:
+        first_runs, second_runs = write_sorted_runs(file_path, run_dir, run_size)
+
+        first_sorted = rechunk(merge_sorted_runs(first_runs, chunk_size), chunk_size)
+        second_sorted = rechunk(merge_sorted_runs(second_runs, chunk_size), chunk_size)
+
+        total_difference = 0
+        for first_chunk, second_chunk in zip(first_sorted, second_sorted):
+            total_difference += int(np.abs(first_chunk - second_chunk).sum())
+
+        return total_difference
 
-    return sum(multiplied_results.values())
+def part_two(column_one, column_two) -> int:
+    return similarity_score(column_one, column_two)
+
+def sum_products(values, left_counts, right_counts) -> int:
+    """Sum value * left count * right count in Python ints, which can't overflow like int64."""
+    return sum(value * left * right for value, left, right
+               in zip(values.tolist(), left_counts.tolist(), right_counts.tolist()))
+
+def join_counts(left_values, left_counts, right_values, right_counts) -> int:
+    """Sum value * left count * right count over the values present on both sorted sides."""
+    if not len(left_values) or not len(right_values):
+        return 0
+    idx = np.searchsorted(right_values, left_values)
+    idx[idx == len(right_values)] = 0
+    matched = right_values[idx] == left_values
+    return sum_products(left_values[matched], left_counts[matched], right_counts[idx[matched]])
+
+def similarity_score(column_one, column_two, dense_limit: int = 1 << 22) -> int:
+    """
+    Vectorized similarity score: every left value (duplicates included)
+    times the number of times it appears in the right column.
+    Uses a dense bincount when the value domain is small, otherwise
+    joins the np.unique counts of both columns with searchsorted.
+    """
+    left = np.asarray(column_one, dtype=np.int64)
+    right = np.asarray(column_two, dtype=np.int64)
+    if not len(left) or not len(right):
+        return 0
+
+    low = min(left.min(), right.min())
+    high = max(left.max(), right.max())
+    if high - low < dense_limit:
+        left_counts = np.bincount(left - low, minlength=high - low + 1)
+        right_counts = np.bincount(right - low, minlength=high - low + 1)
+        shared = np.flatnonzero((left_counts > 0) & (right_counts > 0))
+        return sum_products(shared + low, left_counts[shared], right_counts[shared])
+
+    left_values, left_counts = np.unique(left, return_counts=True)
+    right_values, right_counts = np.unique(right, return_counts=True)
+    return join_counts(left_values, left_counts, right_values, right_counts)
+
+def run_lengths(sorted_chunks):
+    """
+    Turn a stream of sorted chunks into (values, counts) blocks.
+    The last value of each chunk is held back until the next chunk shows
+    whether its run continues, so every emitted count is complete.
+    """
+    carry_value, carry_count = None, 0
+    for chunk in sorted_chunks:
+        if not len(chunk):
+            continue
+        values, counts = np.unique(np.asarray(chunk, dtype=np.int64), return_counts=True)
+        if carry_value is not None:
+            if values[0] == carry_value:
+                counts[0] += carry_count
+            else:
+                values = np.concatenate(([carry_value], values))
+                counts = np.concatenate(([carry_count], counts))
+        carry_value, carry_count = values[-1], counts[-1]
+        if len(values) > 1:
+            yield values[:-1], counts[:-1]
+    if carry_value is not None:
+        yield np.array([carry_value]), np.array([carry_count])
+
+def similarity_score_sorted_streams(first_sorted, second_sorted) -> int:
+    """
+    Merge-join two streams of pre-sorted chunks into the similarity score
+    without materializing either column.
+    """
+    left_blocks = run_lengths(first_sorted)
+    right_blocks = run_lengths(second_sorted)
+    empty = np.empty(0, dtype=np.int64)
+    left_values, left_counts = next(left_blocks, (empty, empty))
+    right_values, right_counts = next(right_blocks, (empty, empty))
+
+    total = 0
+    while len(left_values) and len(right_values):
+        # Values up to the smaller block tail are complete on both sides.
+        cutoff = min(left_values[-1], right_values[-1])
+        left_split = np.searchsorted(left_values, cutoff, side="right")
+        right_split = np.searchsorted(right_values, cutoff, side="right")
+        total += join_counts(left_values[:left_split], left_counts[:left_split],
+                             right_values[:right_split], right_counts[:right_split])
+
+        left_values, left_counts = left_values[left_split:], left_counts[left_split:]
+        right_values, right_counts = right_values[right_split:], right_counts[right_split:]
+        if not len(left_values):
+            left_values, left_counts = next(left_blocks, (empty, empty))
+        if not len(right_values):
+            right_values, right_counts = next(right_blocks, (empty, empty))
+
+    return total
+
+def part_two_out_of_core(file_path: str, run_size: int = 1_000_000, chunk_size: int = 1_000_000) -> int:
+    """Similarity score streamed from disk-backed sorted runs, like part_one_out_of_core."""
+    with tempfile.TemporaryDirectory() as run_dir:
+        first_runs, second_runs = write_sorted_runs(file_path, run_dir, run_size)
+        return similarity_score_sorted_streams(merge_sorted_runs(first_runs, chunk_size),
+                                               merge_sorted_runs(second_runs, chunk_size))
 
 def read_input(file_path: str) -> np.array:
     with open(file_path, "r") as file:
@@ -40,7 +236,13 @@ def day_one():
     part_two_solution = part_two(first_column, second_column)
 
     assert part_one_solution == 1970720
+    assert part_one_out_of_core(file_name, run_size=100, chunk_size=64) == part_one_solution
     assert part_two_solution == 17191599
+    # Duplicated left values each count, and the products don't overflow int64
+    assert part_two([3, 3, 4], [3, 3, 5]) == 12
+    assert similarity_score(np.full(10_000, 10**12), np.full(10_000, 10**12)) == 10**20
+    assert similarity_score(np.repeat([7, 10**12], 10_000), np.repeat([7, 10**12], 10_000)) == (7 + 10**12) * 10**8
+    assert part_two_out_of_core(file_name, run_size=100, chunk_size=64) == part_two_solution
 
     print(part_one_solution)
     print(part_two_solution)
@@ -1,28 +1,8 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
 
-def count_increasing_violations(row):
-    """Counts the number of violations in the increasing rule."""
-    return sum(1 for i in range(len(row) - 1) if not (row[i] < row[i+1])) <= 1
+import numpy as np
 
-def count_decreasing_violations(row):
-    """Counts the number of violations in the decreasing rule."""
-    return sum(1 for i in range(len(row) - 1) if not (row[i] > row[i+1])) <= 1
-
-def count_difference_violations(row):
-    """Counts the number of violations in the adjacent difference rule."""
-    return sum(1 for i in range(len(row) - 1) if not (1 <= abs(row[i] - row[i+1]) <= 3)) <= 1
-
-def is_safe(row):
-    increasing = all(row[i] < row[i + 1] for i in range(len(row) - 1))
-    decreasing = all(row[i] > row[i + 1] for i in range(len(row) - 1))
-    valid_differences = all(1 <= abs(row[i] - row[i + 1]) <= 3 for i in range(len(row) - 1))
-    return (increasing or decreasing) and valid_differences
-
-
-def is_safe_with_one_violation(row):
-    increasing = count_increasing_violations(row)
-    decreasing = count_decreasing_violations(row)
-    valid_differences = count_difference_violations(row)
-    return (increasing or decreasing) and valid_differences
 
 def count_safe_rows(file_path, part):
     safe_count = 0
@@ -30,11 +10,11 @@ def count_safe_rows(file_path, part):
     with open(file_path, 'r') as f:
         for line in f:
             row = list(map(int, line.strip().split()))
-            # if part == 1:
-            #     if is_safe(row):
-            #         safe_count += 1
+            if part == 1:
+                if is_safe(row):
+                    safe_count += 1
             if part == 2:
-                if is_safe_with_one_violation(row):
+                if is_safe_with_dampener(row):
                     safe_count += 1
     return safe_count
 
@@ -55,15 +35,73 @@ def is_safe(row):
     return (increasing or decreasing) and valid_differences
 
 
-def is_safe_with_dampener(row):
-    if is_safe(row):
-        return True
+def is_valid_step(row, a, b, sign):
+    """Check the step from level a to level b in the given direction (1 up, -1 down)."""
+    return 1 <= sign * (row[b] - row[a]) <= 3
 
+
+def removal_masks(row, k, sign):
+    """
+    reachable[i] is a bitmask over removal counts: bit j is set when some safe
+    kept sequence in direction sign ends at index i after dropping exactly j
+    earlier levels. A kept level i can follow a kept level i - 1 - r by dropping
+    the r levels in between, so this is O(n * k) mask operations with no copies.
+    """
+    full = (1 << (k + 1)) - 1
+    reachable = [0] * len(row)
     for i in range(len(row)):
-        new_row = row[:i] + row[i + 1:]
-        if is_safe(new_row):
-            return True
-    return False
+        mask = 1 << i if i <= k else 0  # drop everything before i
+        for r in range(min(k, i - 1) + 1):
+            previous = i - 1 - r
+            if reachable[previous] and is_valid_step(row, previous, i, sign):
+                mask |= reachable[previous] << r
+        reachable[i] = mask & full
+    return reachable
+
+
+def find_dampener_removals(row, k=1):
+    """
+    Find the fewest indices (at most k) to drop so the row becomes safe,
+    or None if no such set exists.
+    """
+    n = len(row)
+    best = None
+    for sign in (1, -1):
+        reachable = removal_masks(row, k, sign)
+        # Drop everything after the last kept level and keep the cheapest end.
+        for i in range(max(0, n - 1 - k), n):
+            suffix = n - 1 - i
+            counts = reachable[i] & ((1 << (k + 1 - suffix)) - 1)
+            if counts:
+                removed = (counts & -counts).bit_length() - 1
+                if best is None or removed + suffix < best[0]:
+                    best = (removed + suffix, sign, reachable, i, removed)
+
+    if best is None:
+        # Dropping every level is the only option left.
+        return list(range(n)) if n <= k else None
+
+    # Walk the masks back from the chosen end to recover the dropped indices.
+    _, sign, reachable, i, removed = best
+    dropped = list(range(i + 1, n))
+    while removed != i:
+        for r in range(min(removed, i - 1) + 1):
+            previous = i - 1 - r
+            if is_valid_step(row, previous, i, sign) and reachable[previous] >> (removed - r) & 1:
+                dropped.extend(range(previous + 1, i))
+                i, removed = previous, removed - r
+                break
+    dropped.extend(range(i))
+    return sorted(dropped)
+
+
+def is_safe_with_k_dampener(row, k=1):
+    """Check if a row is safe after removing at most k levels."""
+    return find_dampener_removals(row, k) is not None
+
+
+def is_safe_with_dampener(row):
+    return is_safe_with_k_dampener(row, 1)
 
 
 def count_safe_reports_with_dampener(file_path):
@@ -79,20 +117,122 @@ def count_safe_reports_with_dampener(file_path):
     return safe_count
 
 
-file_path = "../input/day_02.txt"
-safe_reports = count_safe_reports_with_dampener(file_path)
-print(f"Number of safe reports (with Problem Dampener): {safe_reports}")
+def read_reports_matrix(file_path):
+    """
+    Pack the ragged reports into a zero-padded int64 matrix
+    plus a vector holding the length of each report.
+    """
+    with open(file_path, 'r') as f:
+        lines = f.read().split('\n')
+    if lines[-1] == '':
+        lines.pop()  # trailing newline, or an empty file
+
+    lengths = np.fromiter((len(line.split()) for line in lines), dtype=np.int64, count=len(lines))
+    values = np.array(' '.join(lines).split(), dtype=np.int64)
+
+    matrix = np.zeros((len(lines), max(lengths.max(initial=0), 1)), dtype=np.int64)
+    matrix[np.arange(matrix.shape[1]) < lengths[:, None]] = values
+    return matrix, lengths
+
+
+def safe_reports_mask(matrix, lengths, dampener=False):
+    """
+    Evaluate every report at once from the column diffs.
+    With the dampener, dropping level j keeps diffs before j - 1 and from j + 1 on,
+    and replaces diffs j - 1 and j with the single diff matrix[j + 1] - matrix[j - 1].
+    """
+    width = matrix.shape[1]
+    diffs = np.diff(matrix, axis=1)
+    padding = np.arange(width - 1) >= (lengths - 1)[:, None]
+
+    safe = np.zeros(len(lengths), dtype=bool)
+    for sign in (1, -1):
+        good = ((sign * diffs >= 1) & (sign * diffs <= 3)) | padding
+        safe |= good.all(axis=1)
+        if not dampener:
+            continue
+
+        # prefix_ok[:, t]: diffs before t are good; suffix_ok[:, t]: diffs from t on are good.
+        ones = np.ones((len(lengths), 1), dtype=bool)
+        prefix_ok = np.hstack((ones, np.logical_and.accumulate(good, axis=1)))
+        suffix_ok = np.hstack((np.logical_and.accumulate(good[:, ::-1], axis=1)[:, ::-1], ones))
+
+        for j in range(width):
+            left = prefix_ok[:, max(j - 1, 0)]
+            right = suffix_ok[:, min(j + 1, width - 1)]
+            merged_ok = np.ones(len(lengths), dtype=bool)
+            if 1 <= j < width - 1:
+                merged = sign * (matrix[:, j + 1] - matrix[:, j - 1])
+                merged_ok = ((merged >= 1) & (merged <= 3)) | (j + 1 >= lengths)
+            safe |= (j < lengths) & left & right & merged_ok
+
+    return safe | (lengths <= 1)
+
+
+def count_safe_reports_batched(file_path, dampener=False):
+    """Count safe reports with a single vectorized pass over the padded report matrix."""
+    matrix, lengths = read_reports_matrix(file_path)
+    return int(safe_reports_mask(matrix, lengths, dampener).sum())
+
+
+def newline_aligned_ranges(file_path, shards):
+    """Split the file into at most `shards` byte ranges that each end right after a newline."""
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        for i in range(1, shards):
+            f.seek(max(size * i // shards, bounds[-1]))
+            f.readline()  # move to the start of the next full line
+            if f.tell() >= size:
+                break
+            if f.tell() > bounds[-1]:
+                bounds.append(f.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def count_safe_rows_in_range(file_path, start, end, part):
+    """Count safe rows in one newline-aligned byte range, like count_safe_rows does for the whole file."""
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        lines = f.read(end - start).decode().split('\n')
+    if lines and lines[-1] == '':
+        lines.pop()  # the range ends with a newline
+
+    is_row_safe = is_safe if part == 1 else is_safe_with_dampener
+    return sum(1 for line in lines if is_row_safe(list(map(int, line.strip().split()))))
+
+
+def count_safe_rows_parallel(file_path, part, workers=None, shards_per_worker=4):
+    """Count safe rows with shards of the file validated in a process pool."""
+    workers = workers or os.cpu_count() or 1
+    ranges = newline_aligned_ranges(file_path, workers * shards_per_worker)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        counts = pool.map(count_safe_rows_in_range,
+                          [file_path] * len(ranges),
+                          [start for start, _ in ranges],
+                          [end for _, end in ranges],
+                          [part] * len(ranges))
+        return sum(counts)
 
 # --------------
 if __name__ == "__main__":
     file_path = "../input/day_02.txt"
 
-    # solution_part_one = part_one(file_path)
-    # solution_part_two = part_two(file_path)
-    # assert solution_part_one == 680
-    # assert solution_part_two == 210
-    safe_reports = count_safe_reports_with_dampener(file_path)
-    print(f"Number of safe reports (with Problem Dampener): {safe_reports}")
+    solution_part_one = part_one(file_path)
+    solution_part_two = part_two(file_path)
+    assert solution_part_one == 680
+    assert solution_part_two == 710
 
-    # print(f"Number of safe rows for part one: {solution_part_one}")
-    # print(f"Number of safe rows for part two: {solution_part_two}")
+    with open(file_path, 'r') as f:
+        rows = [list(map(int, line.split())) for line in f]
+    assert sum(find_dampener_removals(row, 0) is not None for row in rows) == solution_part_one
+    assert sum(find_dampener_removals(row, 1) is not None for row in rows) == solution_part_two
+    assert count_safe_reports_batched(file_path) == solution_part_one
+    assert count_safe_reports_batched(file_path, dampener=True) == solution_part_two
+    assert count_safe_rows_parallel(file_path, 1, workers=4) == solution_part_one
+    assert count_safe_rows_parallel(file_path, 2, workers=4) == solution_part_two
+
+    print(f"Number of safe rows for part one: {solution_part_one}")
+    print(f"Number of safe rows for part two: {solution_part_two}")
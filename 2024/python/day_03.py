@@ -1,4 +1,6 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 
 file_name = "../input/day_03.txt"
 
@@ -38,6 +40,103 @@ def part_two():
 
     return total_sum
 
+instruction_pattern = re.compile(rb"mul\((\d+),(\d+)\)|do\(\)|don't\(\)")
+# Everything that can still grow into an instruction once more input arrives
+partial_instruction_pattern = re.compile(rb"(?:mul\(\d+,\d*|mul\(\d*|mul|mu|m|don't\(|don't|don'|don|do\(|do|d)\Z")
+
+
+def stream_instructions(file_path: str, chunk_size: int = 1 << 20, start: int = 0, end: int = None):
+    """
+    Yield every mul/do/don't match that starts in the byte range [start, end),
+    reading the corrupted memory in fixed-size chunks. Only the unfinished tail
+    of a chunk (an instruction split across the boundary) is carried into the
+    next one, so an instruction straddling `end` is still read to completion.
+    """
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        carry = b""
+        offset = start  # file offset of carry[0]
+        while chunk := file.read(chunk_size):
+            buffer = carry + chunk
+            last_end = 0
+            for match in instruction_pattern.finditer(buffer):
+                if end is not None and offset + match.start() >= end:
+                    return
+                # Every instruction ends with ")", so a match can't grow with more input.
+                yield match
+                last_end = match.end()
+
+            partial = partial_instruction_pattern.search(buffer, last_end)
+            cut = partial.start() if partial else len(buffer)
+            if end is not None and offset + cut >= end:
+                return
+            carry = buffer[cut:]
+            offset += cut
+
+
+def summarize_instructions(file_path: str, start: int = 0, end: int = None, chunk_size: int = 1 << 20) -> tuple:
+    """
+    Summarize the instructions starting in [start, end) as
+    (sum of all muls, sum if it starts enabled, sum if it starts disabled, final state).
+    The final state is None when the range holds no do()/don't().
+    """
+    all_sum = 0
+    sums = {True: 0, False: 0}
+    final_state = None
+
+    for match in stream_instructions(file_path, chunk_size, start, end):
+        instruction = match.group(0)
+        if instruction == b"do()":
+            final_state = True
+        elif instruction == b"don't()":
+            final_state = False
+        else:
+            product = int(match.group(1)) * int(match.group(2))
+            all_sum += product
+            for initial_state in sums:
+                if (initial_state if final_state is None else final_state):
+                    sums[initial_state] += product
+
+    return all_sum, sums[True], sums[False], final_state
+
+
+def combine_summaries(summaries) -> tuple:
+    """Fold range summaries in file order into the part one and part two totals."""
+    all_sum = 0
+    enabled_sum = 0
+    mul_enabled = True
+
+    for range_all, range_enabled, range_disabled, final_state in summaries:
+        all_sum += range_all
+        enabled_sum += range_enabled if mul_enabled else range_disabled
+        if final_state is not None:
+            mul_enabled = final_state
+
+    return all_sum, enabled_sum
+
+
+def scan_instructions(file_path: str, chunk_size: int = 1 << 20) -> tuple:
+    """Single streaming pass that produces the part one and part two totals together."""
+    return combine_summaries([summarize_instructions(file_path, chunk_size=chunk_size)])
+
+
+def scan_instructions_parallel(file_path: str, workers: int = None, chunk_size: int = 1 << 20) -> tuple:
+    """
+    Summarize byte ranges of the file in a process pool and combine them in order.
+    Each range owns the instructions that start inside it.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(file_path)
+    bounds = sorted({size * i // workers for i in range(workers + 1)})
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = pool.map(summarize_instructions,
+                             [file_path] * (len(bounds) - 1),
+                             bounds[:-1],
+                             bounds[1:],
+                             [chunk_size] * (len(bounds) - 1))
+        return combine_summaries(summaries)
+
 
 def day_one():
     part_one_solution = part_one()
@@ -45,6 +144,8 @@ def day_one():
 
     assert part_one_solution == 183669043
     assert part_two_solution == 59097164
+    assert scan_instructions(file_name, chunk_size=7) == (part_one_solution, part_two_solution)
+    assert scan_instructions_parallel(file_name, workers=4) == (part_one_solution, part_two_solution)
 
     print(part_one_solution)
     print(part_two_solution)
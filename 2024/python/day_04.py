@@ -1,4 +1,7 @@
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from typing import List, Any
 
 import numpy as np
@@ -6,6 +9,19 @@ from numpy import ndarray, dtype
 
 file_name = "../input/day_04.txt"
 
+# Scan all directions
+directions = [
+    (0, 1),  # Horizontal right
+    (0, -1), # Horizontal left
+    (1, 0),  # Vertical down
+    (-1, 0), # Vertical up
+    (1, 1),  # Diagonal forward down
+    (-1, -1),# Diagonal forward up
+    (1, -1), # Diagonal backward down
+    (-1, 1), # Diagonal backward up
+]
+
+
 def count_word_in_matrix(matrix, word):
     word_length = len(word)
     num_rows = len(matrix)
@@ -20,18 +36,6 @@ def count_word_in_matrix(matrix, word):
                 return False
         return True
 
-    # Scan all directions
-    directions = [
-        (0, 1),  # Horizontal right
-        (0, -1), # Horizontal left
-        (1, 0),  # Vertical down
-        (-1, 0), # Vertical up
-        (1, 1),  # Diagonal forward down
-        (-1, -1),# Diagonal forward up
-        (1, -1), # Diagonal backward down
-        (-1, 1), # Diagonal backward up
-    ]
-
     for r in range(num_rows):
         for c in range(num_cols):
             for dr, dc in directions:
@@ -41,6 +45,134 @@ def count_word_in_matrix(matrix, word):
     return count
 
 
+def to_uint8_grid(matrix) -> ndarray:
+    """Convert a <U1 character matrix into a uint8 byte grid."""
+    return np.asarray(matrix).astype("S1").view(np.uint8)
+
+
+def shifted_view(grid: ndarray, dr: int, dc: int, length: int, i: int) -> ndarray:
+    """
+    View of the letters at offset i along (dr, dc) for every start cell
+    whose full run of `length` letters stays inside the grid.
+    """
+    num_rows, num_cols = grid.shape
+    span = length - 1
+    r0, r1 = max(0, -span * dr), num_rows - max(0, span * dr)
+    c0, c1 = max(0, -span * dc), num_cols - max(0, span * dc)
+    if r1 <= r0 or c1 <= c0:
+        return grid[:0, :0]
+    return grid[r0 + i * dr:r1 + i * dr, c0 + i * dc:c1 + i * dc]
+
+
+def count_word_vectorized(grid: ndarray, word: str) -> int:
+    """Same count as count_word_in_matrix using array-wide comparisons per direction and letter."""
+    if grid.dtype != np.uint8:
+        grid = to_uint8_grid(grid)
+    letters = word.encode()
+    count = 0
+
+    for dr, dc in directions:
+        mask = shifted_view(grid, dr, dc, len(letters), 0) == letters[0]
+        for i in range(1, len(letters)):
+            mask &= shifted_view(grid, dr, dc, len(letters), i) == letters[i]
+        count += int(mask.sum())
+
+    return count
+
+
+class AhoCorasick:
+    """Multi-pattern automaton that finds every word of a word list in one pass over a text."""
+
+    def __init__(self, words: List[str]):
+        self.words = list(dict.fromkeys(words))
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [[]]  # indices of words ending at each state, suffix matches included
+
+        for index, word in enumerate(self.words):
+            state = 0
+            for char in word:
+                if char not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[state][char] = len(self.goto) - 1
+                state = self.goto[state][char]
+            self.output[state].append(index)
+
+        # Breadth-first pass so every fail link points at an already finished state
+        queue = list(self.goto[0].values())
+        for state in queue:
+            for char, child in self.goto[state].items():
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+                queue.append(child)
+
+    def iter_matches(self, text: str):
+        """Yield (end index, word index) for every occurrence of every word in text."""
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            for index in self.output[state]:
+                yield position, index
+
+
+def grid_lines(grid: ndarray):
+    """
+    Yield (start cell, step, line) for every row, column and both diagonal
+    families of a uint8 grid, each in its forward orientation as a string.
+    """
+    num_rows, num_cols = grid.shape
+    flipped = grid[:, ::-1]
+    for r in range(num_rows):
+        yield (r, 0), (0, 1), grid[r].tobytes().decode()
+    for c in range(num_cols):
+        yield (0, c), (1, 0), grid[:, c].tobytes().decode()
+    for k in range(1 - num_rows, num_cols):
+        yield (max(0, -k), max(0, k)), (1, 1), grid.diagonal(k).tobytes().decode()
+    for k in range(1 - num_rows, num_cols):
+        yield (max(0, -k), num_cols - 1 - max(0, k)), (1, -1), flipped.diagonal(k).tobytes().decode()
+
+
+def count_words(matrix, words: List[str], with_coordinates: bool = False):
+    """
+    Count every word of the list in all 8 directions with one automaton pass
+    per line. The automaton also holds every word reversed, so a match of a
+    reversed word is the original word read against the line's direction.
+    Counts match count_word_in_matrix per word.
+    With with_coordinates, also return each word's matches as (start cell, direction).
+    """
+    words = list(dict.fromkeys(words))
+    patterns = {}  # pattern -> [(word, backward)], a palindrome is found both ways
+    for word in words:
+        patterns.setdefault(word, []).append((word, False))
+        patterns.setdefault(word[::-1], []).append((word, True))
+    automaton = AhoCorasick(list(patterns))
+    grid = to_uint8_grid(matrix) if np.asarray(matrix).dtype != np.uint8 else matrix
+    counts = dict.fromkeys(words, 0)
+    locations = {word: [] for word in words}
+
+    for (r0, c0), (dr, dc), line in grid_lines(grid):
+        for end, index in automaton.iter_matches(line):
+            for word, backward in patterns[automaton.words[index]]:
+                counts[word] += 1
+                if with_coordinates:
+                    if backward:
+                        i, direction = end, (-dr, -dc)
+                    else:
+                        i, direction = end - len(word) + 1, (dr, dc)
+                    locations[word].append(((r0 + i * dr, c0 + i * dc), direction))
+
+    if with_coordinates:
+        return counts, locations
+    return counts
+
+
 def read_input_as_matrix(file_path: str) -> ndarray[Any, dtype[Any]]:
     with open(file_path, "r") as file:
         return np.array([list(row) for row in file.read().strip().split("\n")])
@@ -74,6 +206,109 @@ def count_xmas(matrix):
     return count
 
 
+xmas_template = [
+    "M.S",
+    ".A.",
+    "M.S",
+]
+
+
+def template_variants(template: List[str], rotations: bool = False, reflections: bool = False) -> List[ndarray]:
+    """Distinct uint8 orientations of a template (symmetric ones collapse into one)."""
+    base = to_uint8_grid(np.array([list(row) for row in template]))
+    candidates = [base, np.fliplr(base)] if reflections else [base]
+    if rotations:
+        candidates = [np.rot90(candidate, k) for candidate in candidates for k in range(4)]
+
+    variants = {}
+    for candidate in candidates:
+        variants.setdefault((candidate.shape, candidate.tobytes()), np.ascontiguousarray(candidate))
+    return list(variants.values())
+
+
+def match_template(grid: ndarray, template: ndarray, wildcard: str = ".") -> ndarray:
+    """Boolean mask over top-left corners where every non-wildcard template cell matches the grid."""
+    height, width = template.shape
+    out_rows, out_cols = grid.shape[0] - height + 1, grid.shape[1] - width + 1
+    if out_rows <= 0 or out_cols <= 0:
+        return np.zeros((0, 0), dtype=bool)
+
+    mask = np.ones((out_rows, out_cols), dtype=bool)
+    for i, j in zip(*np.nonzero(template != ord(wildcard))):
+        mask &= grid[i:i + out_rows, j:j + out_cols] == template[i, j]
+    return mask
+
+
+def locate_template(matrix, template: List[str], wildcard: str = ".",
+                    rotations: bool = False, reflections: bool = False) -> List[tuple]:
+    """Return (variant, top-left coordinates) for every orientation of the template."""
+    grid = to_uint8_grid(matrix) if np.asarray(matrix).dtype != np.uint8 else matrix
+    return [(variant, np.argwhere(match_template(grid, variant, wildcard)))
+            for variant in template_variants(template, rotations, reflections)]
+
+
+def count_template(matrix, template: List[str], wildcard: str = ".",
+                   rotations: bool = False, reflections: bool = False) -> int:
+    """Count every placement of every orientation of the template."""
+    grid = to_uint8_grid(matrix) if np.asarray(matrix).dtype != np.uint8 else matrix
+    return sum(int(match_template(grid, variant, wildcard).sum())
+               for variant in template_variants(template, rotations, reflections))
+
+
+def count_band(shm_name: str, shape: tuple, start: int, stop: int, halo: int, word: str = None) -> int:
+    """
+    Count matches whose top row lies in [start, stop) on the shared grid.
+    The band is read with a halo of extra rows below it; matches that fit
+    entirely inside the halo belong to the next band and are subtracted.
+    Counts `word` in all directions, or X-MAS shapes when no word is given.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        grid = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        if word is None:
+            def count(rows):
+                return count_template(rows, xmas_template, rotations=True)
+        else:
+            def count(rows):
+                return count_word_vectorized(rows, word)
+
+        result = count(grid[start:stop + halo])
+        if stop < shape[0]:
+            result -= count(grid[stop:stop + halo])
+        del grid
+        return result
+    finally:
+        shm.close()
+
+
+def count_in_bands(matrix, word: str = None, workers: int = None, band_rows: int = None) -> int:
+    """
+    Split the grid into horizontal bands and count each band in a worker process.
+    Workers attach to one shared-memory copy of the uint8 grid.
+    """
+    grid = to_uint8_grid(matrix)
+    workers = workers or os.cpu_count() or 1
+    halo = len(word) - 1 if word is not None else len(xmas_template) - 1
+    band_rows = band_rows or max(1, -(-grid.shape[0] // workers))
+    bounds = list(range(0, grid.shape[0], band_rows)) + [grid.shape[0]]
+
+    shm = shared_memory.SharedMemory(create=True, size=max(grid.nbytes, 1))
+    try:
+        np.ndarray(grid.shape, dtype=np.uint8, buffer=shm.buf)[:] = grid
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            counts = pool.map(count_band,
+                              [shm.name] * (len(bounds) - 1),
+                              [grid.shape] * (len(bounds) - 1),
+                              bounds[:-1],
+                              bounds[1:],
+                              [halo] * (len(bounds) - 1),
+                              [word] * (len(bounds) - 1))
+            return sum(counts)
+    finally:
+        shm.close()
+        shm.unlink()
+
+
 def part_two() -> int:
     matrix = read_input_as_matrix(file_name)
     result = count_xmas(matrix)
@@ -84,7 +319,12 @@ def day_four():
     part_two_solution = part_two()
 
     assert part_one_solution == 2414
+    assert count_word_vectorized(read_input_as_matrix(file_name), "XMAS") == part_one_solution
+    assert count_words(read_input_as_matrix(file_name), ["XMAS"])["XMAS"] == part_one_solution
     # assert part_two_solution == 3494
+    assert count_template(read_input_as_matrix(file_name), xmas_template, rotations=True) == part_two_solution
+    assert count_in_bands(read_input_as_matrix(file_name), "XMAS", workers=4) == part_one_solution
+    assert count_in_bands(read_input_as_matrix(file_name), workers=4) == part_two_solution
 
     print(part_one_solution)
     print(part_two_solution)
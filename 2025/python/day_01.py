@@ -1,3 +1,8 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
 def read_rotations(file_path: str) -> list:
     """Read rotation instructions from the input file."""
     rotations = []
@@ -59,6 +64,207 @@ def part_two(rotations: list) -> int:
 
     return count
 
+def read_deltas(file_path: str) -> np.ndarray:
+    """Read rotation instructions straight into signed deltas (R positive, L negative)."""
+    with open(file_path, "r") as file:
+        return parse_deltas(file.read())
+
+def rotations_to_deltas(rotations: list) -> np.ndarray:
+    """Convert (direction, distance) tuples into signed deltas."""
+    return np.fromiter((distance if direction == 'R' else -distance for direction, distance in rotations),
+                       dtype=np.int64, count=len(rotations))
+
+def unwrapped_positions(deltas: np.ndarray, start: int = 50) -> np.ndarray:
+    """Dial position after every rotation before taking the modulo; index 0 is the start."""
+    positions = np.empty(len(deltas) + 1, dtype=np.int64)
+    positions[0] = start
+    np.cumsum(deltas, out=positions[1:])
+    positions[1:] += start
+    return positions
+
+def count_zero_landings(deltas: np.ndarray, dial_size: int = 100, start: int = 50) -> int:
+    """Vectorized part_one: rotations that end with the dial on 0."""
+    positions = unwrapped_positions(deltas, start)[1:] % dial_size
+    return int(np.count_nonzero(positions == 0))
+
+def count_zero_clicks(deltas: np.ndarray, dial_size: int = 100, start: int = 50) -> int:
+    """
+    Vectorized part_two: every click that points at 0.
+    On the unwrapped dial a right turn from a to b passes the multiples of the
+    dial size in (a, b], and a left turn passes those in [b, a).
+    Starting a left turn on 0 therefore doesn't count that 0 again.
+    """
+    positions = unwrapped_positions(deltas, start)
+    before, after = positions[:-1], positions[1:]
+    right_hits = after // dial_size - before // dial_size
+    left_hits = (before - 1) // dial_size - (after - 1) // dial_size
+    return int(np.where(deltas > 0, right_hits, left_hits).sum())
+
+def parse_deltas(text: str) -> np.ndarray:
+    """Parse rotation text into signed deltas (R positive, L negative)."""
+    return np.array(text.replace("L", "-").replace("R", "").split(), dtype=np.int64)
+
+def floor_steps(values: np.ndarray, signs: np.ndarray, dial_size: int) -> np.ndarray:
+    """
+    Table of sum(sign * ((s + value) // dial_size)) for every start s in [0, dial_size).
+    Each term is value // dial_size plus one step once s reaches dial_size - value % dial_size.
+    """
+    constant = int((signs * (values // dial_size)).sum())
+    remainders = values % dial_size
+    stepping = remainders != 0
+    thresholds = dial_size - remainders[stepping]
+    steps = (np.bincount(thresholds[signs[stepping] > 0], minlength=dial_size)
+             - np.bincount(thresholds[signs[stepping] < 0], minlength=dial_size))
+    return constant + np.cumsum(steps[:dial_size])
+
+def summarize_deltas(deltas: np.ndarray, dial_size: int = 100) -> tuple:
+    """
+    Summarize a run of rotations as (net delta, landings by start, clicks by start),
+    where landings[s] and clicks[s] are the part_one and part_two counts for the
+    run when the dial starts it at position s.
+    """
+    offsets = unwrapped_positions(deltas, 0)
+    before, after = offsets[:-1], offsets[1:]
+
+    landings = np.bincount(-after % dial_size, minlength=dial_size)
+
+    right = deltas > 0
+    values = np.concatenate((np.where(right, after, before - 1), np.where(right, before, after - 1)))
+    signs = np.concatenate((np.ones(len(deltas), dtype=np.int64), -np.ones(len(deltas), dtype=np.int64)))
+    clicks = floor_steps(values, signs, dial_size)
+
+    return int(offsets[-1]), landings, clicks
+
+def compose_summaries(first: tuple, second: tuple, dial_size: int = 100) -> tuple:
+    """Summary of running `first` and then `second`."""
+    first_net, first_landings, first_clicks = first
+    second_net, second_landings, second_clicks = second
+    # Starting the pair at s means starting `second` at (s + first_net) % dial_size
+    shift = -(first_net % dial_size)
+    return (first_net + second_net,
+            first_landings + np.roll(second_landings, shift),
+            first_clicks + np.roll(second_clicks, shift))
+
+def summarize_range(file_path: str, start: int, end: int, dial_size: int = 100,
+                    block_size: int = 1 << 24) -> tuple:
+    """Summarize the rotations in a newline-aligned byte range, block_size bytes at a time."""
+    summary = (0, np.zeros(dial_size, dtype=np.int64), np.zeros(dial_size, dtype=np.int64))
+    with open(file_path, "rb") as file:
+        file.seek(start)
+        remaining = end - start
+        carry = b""
+        while remaining > 0:
+            block = carry + file.read(min(block_size, remaining))
+            remaining = end - file.tell()
+            cut = block.rfind(b"\n") + 1 if remaining > 0 else len(block)
+            block, carry = block[:cut], block[cut:]
+            summary = compose_summaries(summary, summarize_deltas(parse_deltas(block.decode()), dial_size), dial_size)
+    return summary
+
+def newline_aligned_ranges(file_path: str, shards: int) -> list:
+    """Split the file into at most `shards` byte ranges that each end right after a newline."""
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, "rb") as file:
+        for i in range(1, shards):
+            file.seek(max(size * i // shards, bounds[-1]))
+            file.readline()
+            if file.tell() >= size:
+                break
+            if file.tell() > bounds[-1]:
+                bounds.append(file.tell())
+    bounds.append(size)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+def count_zeros_parallel(file_path: str, dial_size: int = 100, start: int = 50,
+                         workers: int = None, block_size: int = 1 << 24) -> tuple:
+    """
+    Exact (part_one, part_two) for a rotation log, summarizing byte ranges in a
+    process pool and folding the summaries in order from the start position.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = newline_aligned_ranges(file_path, workers)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        summaries = pool.map(summarize_range,
+                             [file_path] * len(ranges),
+                             [range_start for range_start, _ in ranges],
+                             [range_end for _, range_end in ranges],
+                             [dial_size] * len(ranges),
+                             [block_size] * len(ranges))
+
+        position = start
+        landings = 0
+        clicks = 0
+        for net, range_landings, range_clicks in summaries:
+            landings += int(range_landings[position])
+            clicks += int(range_clicks[position])
+            position = (position + net) % dial_size
+        return landings, clicks
+
+class DialIndex:
+    """
+    Prefix index over a rotation log for O(1) window queries.
+    positions[i] is the unwrapped dial position after i rotations, and hits[i] and
+    landings[i] are the part_two and part_one counts of the first i rotations.
+    The arrays grow by doubling, so appending rotations is amortized O(1) each.
+    """
+
+    def __init__(self, rotations: list = (), dial_size: int = 100, start: int = 50):
+        self.dial_size = dial_size
+        self.length = 0
+        self.positions = np.zeros(1, dtype=np.int64)
+        self.hits = np.zeros(1, dtype=np.int64)
+        self.landings = np.zeros(1, dtype=np.int64)
+        self.positions[0] = start
+        self.extend_deltas(rotations_to_deltas(list(rotations)))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def append(self, direction: str, distance: int):
+        """Add a single rotation to the end of the log."""
+        self.extend_deltas(np.array([distance if direction == 'R' else -distance], dtype=np.int64))
+
+    def extend(self, rotations: list):
+        """Add (direction, distance) rotations to the end of the log."""
+        self.extend_deltas(rotations_to_deltas(list(rotations)))
+
+    def extend_deltas(self, deltas: np.ndarray):
+        """Add signed deltas to the end of the log."""
+        new_length = self.length + len(deltas)
+        if new_length + 1 > len(self.positions):
+            capacity = max(new_length + 1, 2 * len(self.positions))
+            for name in ("positions", "hits", "landings"):
+                grown = np.zeros(capacity, dtype=np.int64)
+                grown[:self.length + 1] = getattr(self, name)[:self.length + 1]
+                setattr(self, name, grown)
+
+        window = slice(self.length, new_length + 1)
+        positions = unwrapped_positions(deltas, int(self.positions[self.length]))
+        before, after = positions[:-1], positions[1:]
+        clicks = np.where(deltas > 0,
+                          after // self.dial_size - before // self.dial_size,
+                          (before - 1) // self.dial_size - (after - 1) // self.dial_size)
+
+        self.positions[window] = positions
+        self.hits[window] = self.hits[self.length] + np.concatenate(([0], np.cumsum(clicks)))
+        self.landings[window] = self.landings[self.length] + np.concatenate(
+            ([0], np.cumsum(after % self.dial_size == 0)))
+        self.length = new_length
+
+    def position_after(self, i: int) -> int:
+        """Dial position after the first i rotations (i = 0 is the start)."""
+        return int(self.positions[i] % self.dial_size)
+
+    def zero_hits(self, i: int, j: int) -> int:
+        """Clicks that point at 0 during rotations i through j - 1."""
+        return int(self.hits[j] - self.hits[i])
+
+    def zero_landings(self, i: int, j: int) -> int:
+        """Rotations among i through j - 1 that end on 0."""
+        return int(self.landings[j] - self.landings[i])
+
 def day_one():
     file_name = "../input/day_01.txt"
     rotations = read_rotations(file_name)
@@ -66,6 +272,13 @@ def day_one():
     part_one_solution = part_one(rotations)
     part_two_solution = part_two(rotations)
 
+    deltas = read_deltas(file_name)
+    assert count_zero_landings(deltas) == part_one_solution
+    assert count_zero_clicks(deltas) == part_two_solution
+    index = DialIndex(rotations)
+    assert (index.zero_landings(0, len(index)), index.zero_hits(0, len(index))) == (part_one_solution, part_two_solution)
+    assert count_zeros_parallel(file_name, workers=4, block_size=4096) == (part_one_solution, part_two_solution)
+
     print(f"Part 1: {part_one_solution}")
     print(f"Part 2: {part_two_solution}")
 
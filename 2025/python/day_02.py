@@ -1,3 +1,5 @@
+import heapq
+
 def is_invalid_id(num: int) -> bool:
     """
     Check if a number is invalid (made of some sequence repeated twice).
@@ -69,6 +71,108 @@ def part_two(ranges: list) -> int:
 
     return total
 
+def repeated_pattern_ids(low: int, high: int, multiplier: int, primitive_only: bool):
+    """Yield pattern * multiplier for the patterns in [low, high], skipping repeated patterns if asked."""
+    for pattern in range(low, high + 1):
+        if not (primitive_only and is_invalid_id_v2(pattern)):
+            yield pattern * multiplier
+
+def generate_invalid_ids(start: int, end: int, exactly_twice: bool = False):
+    """
+    Yield the invalid IDs in [start, end] in increasing order without visiting the valid ones.
+    A length-L number made of a length-k pattern repeated L/k times is
+    pattern * (10^(k*(m-1)) + ... + 10^k + 1), so for every length and period the
+    matching patterns form one clipped range. IDs with several periods
+    (like 222222) only come from their shortest one, where the pattern
+    itself isn't a repetition.
+    """
+    for length in range(len(str(max(start, 1))), len(str(end)) + 1):
+        streams = []
+        for period in range(1, length // 2 + 1):
+            if length % period != 0:
+                continue
+            if exactly_twice and length // period != 2:
+                continue
+
+            multiplier = (10 ** length - 1) // (10 ** period - 1)
+            low = max(10 ** (period - 1), -(-start // multiplier))
+            high = min(10 ** period - 1, end // multiplier)
+            streams.append(repeated_pattern_ids(low, high, multiplier, primitive_only=not exactly_twice))
+        yield from heapq.merge(*streams)
+
+def part_one_generated(ranges: list) -> int:
+    """part_one, but only touching the invalid IDs of each range."""
+    return sum(sum(generate_invalid_ids(start, end, exactly_twice=True)) for start, end in ranges)
+
+def part_two_generated(ranges: list) -> int:
+    """part_two, but only touching the invalid IDs of each range."""
+    return sum(sum(generate_invalid_ids(start, end)) for start, end in ranges)
+
+def mobius(n: int) -> int:
+    """Möbius function: 0 if n has a squared prime factor, else (-1)^(number of prime factors)."""
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    return -result if n > 1 else result
+
+def repeated_pattern_prefix(n: int, length: int, period: int) -> tuple:
+    """
+    (sum, count) of the length-digit numbers <= n that repeat a period-digit pattern,
+    using the arithmetic series of the patterns times their multiplier.
+    """
+    multiplier = (10 ** length - 1) // (10 ** period - 1)
+    low = 10 ** (period - 1)
+    high = min(10 ** period - 1, n // multiplier)
+    if high < low:
+        return 0, 0
+    count = high - low + 1
+    return multiplier * (low + high) * count // 2, count
+
+def invalid_prefix(n: int, exactly_twice: bool = False) -> tuple:
+    """
+    F(n) = (sum, count) of the invalid IDs in [1, n], in time polylogarithmic in n.
+    For the "at least twice" rule the periodic numbers of each length L are the union
+    of the sets for every proper period k of L; Möbius inversion over the divisors
+    turns that union into -sum(mobius(L / k) * F_k), counting each number once.
+    """
+    total, count = 0, 0
+    if n < 1:
+        return total, count
+
+    for length in range(2, len(str(n)) + 1):
+        if exactly_twice:
+            weighted_periods = [(length // 2, 1)] if length % 2 == 0 else []
+        else:
+            weighted_periods = [(period, -mobius(length // period))
+                                for period in range(1, length // 2 + 1) if length % period == 0]
+        for period, weight in weighted_periods:
+            if weight:
+                period_sum, period_count = repeated_pattern_prefix(n, length, period)
+                total += weight * period_sum
+                count += weight * period_count
+
+    return total, count
+
+def invalid_in_range(start: int, end: int, exactly_twice: bool = False) -> tuple:
+    """(sum, count) of the invalid IDs in [start, end] as F(end) - F(start - 1)."""
+    end_sum, end_count = invalid_prefix(end, exactly_twice)
+    before_sum, before_count = invalid_prefix(start - 1, exactly_twice)
+    return end_sum - before_sum, end_count - before_count
+
+def part_one_prefix(ranges: list) -> int:
+    """part_one answered with prefix sums of invalid IDs."""
+    return sum(invalid_in_range(start, end, exactly_twice=True)[0] for start, end in ranges)
+
+def part_two_prefix(ranges: list) -> int:
+    """part_two answered with prefix sums of invalid IDs."""
+    return sum(invalid_in_range(start, end)[0] for start, end in ranges)
+
 def day_two():
     file_name = "../input/day_02.txt"
 
@@ -80,6 +184,11 @@ def day_two():
     part_one_solution = part_one(ranges)
     part_two_solution = part_two(ranges)
 
+    assert part_one_generated(ranges) == part_one_solution
+    assert part_two_generated(ranges) == part_two_solution
+    assert part_one_prefix(ranges) == part_one_solution
+    assert part_two_prefix(ranges) == part_two_solution
+
     print(f"Part 1: {part_one_solution}")
     print(f"Part 2: {part_two_solution}")
 
@@ -1,3 +1,37 @@
+import numpy as np
+
+def digits_to_int(digits) -> int:
+    """
+    Build the integer spelled by a sequence of digit characters.
+    Works block by block with integer arithmetic, so it isn't subject to
+    the 4300-digit limit on int(str).
+    """
+    value = 0
+    for i in range(0, len(digits), 4000):
+        block = ''.join(digits[i:i + 4000])
+        value = value * 10 ** len(block) + int(block)
+    return value
+
+def find_max_joltage_k(bank: str, k: int) -> int:
+    """
+    Find the maximum joltage by selecting exactly k batteries, in O(n).
+    Classic "remove n - k digits" monotonic stack: drop a smaller digit from the
+    stack whenever a larger one arrives and there are still digits left to drop.
+    """
+    n = len(bank)
+    if n < k or k <= 0:
+        return 0
+
+    to_drop = n - k
+    stack = []
+    for digit in bank:
+        while to_drop and stack and stack[-1] < digit:
+            stack.pop()
+            to_drop -= 1
+        stack.append(digit)
+
+    return digits_to_int(stack[:k])
+
 def find_max_joltage(bank: str) -> int:
     """
     Find the maximum joltage possible from a bank of batteries.
@@ -19,7 +53,7 @@ def part_one(banks: list) -> int:
     total = 0
 
     for bank in banks:
-        max_joltage = find_max_joltage(bank)
+        max_joltage = find_max_joltage_k(bank, 2)
         total += max_joltage
 
     return total
@@ -59,11 +93,118 @@ def part_two(banks: list) -> int:
     total = 0
 
     for bank in banks:
-        max_joltage = find_max_joltage_12(bank)
+        max_joltage = find_max_joltage_k(bank, 12)
         total += max_joltage
 
     return total
 
+class RangeMaxIndex:
+    """Sparse table answering leftmost-maximum queries on a bank in O(1) after O(n log n) setup"""
+
+    def __init__(self, bank: str):
+        self.bank = bank
+        # table[j][i] is the position of the leftmost maximum in bank[i:i + 2 ** j]
+        self.table = [list(range(len(bank)))]
+        width = 1
+        while 2 * width <= len(bank):
+            previous = self.table[-1]
+            self.table.append([self.better(previous[i], previous[i + width])
+                               for i in range(len(bank) - 2 * width + 1)])
+            width *= 2
+
+    def better(self, left: int, right: int) -> int:
+        """Pick the larger digit, preferring the left position on ties"""
+        return right if self.bank[right] > self.bank[left] else left
+
+    def query(self, start: int, end: int) -> int:
+        """Position of the leftmost maximum digit in bank[start:end]"""
+        level = (end - start).bit_length() - 1
+        row = self.table[level]
+        return self.better(row[start], row[end - (1 << level)])
+
+def joltage_profile(bank: str) -> dict:
+    """
+    Maximum joltage for every selection size k from 1 to len(bank).
+    Each greedy step of find_max_joltage_12 becomes one O(1) range-max query
+    on an index built once for the bank.
+    """
+    index = RangeMaxIndex(bank)
+    n = len(bank)
+    profile = {}
+
+    for k in range(1, n + 1):
+        result = []
+        start = 0
+        for i in range(k):
+            max_pos = index.query(start, n - (k - i) + 1)
+            result.append(bank[max_pos])
+            start = max_pos + 1
+        profile[k] = digits_to_int(result)
+
+    return profile
+
+def read_banks_matrix(banks: list) -> np.ndarray:
+    """Load equal-length banks into a (banks, batteries) uint8 digit matrix."""
+    if len({len(bank) for bank in banks}) > 1:
+        raise ValueError("Batched mode needs banks of equal length")
+    if not banks:
+        return np.zeros((0, 0), dtype=np.uint8)
+    raw = np.frombuffer(''.join(banks).encode(), dtype=np.uint8)
+    return (raw - ord('0')).reshape(len(banks), -1)
+
+def digits_total(selected: np.ndarray) -> int:
+    """
+    Sum the numbers spelled by each row of a digit matrix.
+    Column sums stay small, so the place values are applied in Python ints and
+    the total can't overflow int64 no matter how many digits are selected.
+    """
+    column_sums = selected.sum(axis=0, dtype=np.int64)
+    width = selected.shape[1]
+    return sum(int(column_sum) * 10 ** (width - 1 - i) for i, column_sum in enumerate(column_sums))
+
+def select_two_batch(digits: np.ndarray) -> np.ndarray:
+    """Best 2-digit selection of every bank: each first digit paired with the maximum after it."""
+    suffix_max = np.maximum.accumulate(digits[:, :0:-1], axis=1)[:, ::-1]
+    first = np.argmax(10 * digits[:, :-1].astype(np.int64) + suffix_max, axis=1)
+    rows = np.arange(len(digits))
+    return np.stack((digits[rows, first], suffix_max[rows, first]), axis=1)
+
+def select_k_batch(digits: np.ndarray, k: int) -> np.ndarray:
+    """
+    Best k-digit selection of every bank at once, using the same greedy as
+    find_max_joltage_12: each step takes the leftmost maximum of the window
+    that still leaves enough batteries for the remaining picks.
+    """
+    num_banks, n = digits.shape
+    columns = np.arange(n)
+    rows = np.arange(num_banks)
+    start = np.zeros(num_banks, dtype=np.int64)
+    selected = np.empty((num_banks, k), dtype=np.uint8)
+    signed_digits = digits.astype(np.int8)  # so -1 can mark positions outside the window
+
+    for i in range(k):
+        max_end = n - k + i + 1
+        window = (columns >= start[:, None]) & (columns < max_end)
+        position = np.argmax(np.where(window, signed_digits, -1), axis=1)
+        selected[:, i] = digits[rows, position]
+        start = position + 1
+
+    return selected
+
+def part_one_batch(banks: list) -> int:
+    """part_one evaluated for all banks at once."""
+    digits = read_banks_matrix(banks)
+    if digits.shape[1] < 2:
+        return 0
+    return digits_total(select_two_batch(digits))
+
+def part_two_batch(banks: list, k: int = 12) -> int:
+    """part_two evaluated for all banks at once."""
+    digits = read_banks_matrix(banks)
+    if digits.shape[1] < k:
+        return 0
+    return digits_total(select_k_batch(digits, k))
+
 def day_three():
     file_name = "../input/day_03.txt"
 
@@ -73,6 +214,11 @@ def day_three():
     part_one_solution = part_one(banks)
     part_two_solution = part_two(banks)
 
+    assert part_one_batch(banks) == part_one_solution
+    assert part_two_batch(banks) == part_two_solution
+    profile = joltage_profile(banks[0])
+    assert (profile[2], profile[12]) == (find_max_joltage(banks[0]), find_max_joltage_12(banks[0]))
+
     print(f"Part 1: {part_one_solution}")
     print(f"Part 2: {part_two_solution}")
 
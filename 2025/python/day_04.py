@@ -1,11 +1,24 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import NamedTuple
+
 import numpy as np
 
+class RemovalRound(NamedTuple):
+    """One round of roll removal: the round number and the flat (row * cols + col) indices removed"""
+    round_num: int
+    removed: np.ndarray
+
+
 class PaperGrid:
     """Custom data structure for managing the paper roll grid"""
 
     def __init__(self, grid: list):
         # Convert list of strings to a proper 2D NumPy array
-        self.grid = np.array([list(row) for row in grid])
+        if len({len(row) for row in grid}) > 1:
+            raise ValueError("Grid rows must all have the same length")
+        self.grid = np.array(grid).view('<U1').reshape(len(grid), -1)
         self.rows, self.cols = self.grid.shape
         # Define 8 directions: up-left, up, up-right, left, right, down-left, down, down-right
         self.directions = [(-1, -1), (-1, 0), (-1, 1),
@@ -45,6 +58,36 @@ class PaperGrid:
                     count += 1
         return count
 
+    def roll_mask(self) -> np.ndarray:
+        """Boolean mask of the cells holding a paper roll"""
+        # Compare the UCS-4 code points directly; string comparison is much slower
+        return self.grid.view(np.uint32) == ord('@')
+
+    @staticmethod
+    def neighbor_counts(mask: np.ndarray) -> np.ndarray:
+        """Number of rolls in the 8 adjacent cells of every cell, as a padded 3x3 sum of shifted slices"""
+        return PaperGrid.neighbor_counts_padded(np.pad(mask, 1).view(np.uint8))
+
+    @staticmethod
+    def neighbor_counts_padded(padded: np.ndarray) -> np.ndarray:
+        """neighbor_counts for the inner cells of a 0/1 uint8 array that already has its one-cell border"""
+        rows, cols = padded.shape[0] - 2, padded.shape[1] - 2
+        counts = np.zeros((rows, cols), dtype=np.uint8)
+        for dr in (-1, 0, 1):
+            for dc in (-1, 0, 1):
+                if dr or dc:
+                    counts += padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + cols]
+        return counts
+
+    def accessible_mask(self) -> np.ndarray:
+        """Vectorized is_accessible for every cell at once"""
+        mask = self.roll_mask()
+        return mask & (self.neighbor_counts(mask) < 4)
+
+    def count_accessible_rolls_vectorized(self) -> int:
+        """Same count as count_accessible_rolls without per-cell Python calls"""
+        return int(np.count_nonzero(self.accessible_mask()))
+
     def get_accessible_positions(self) -> list:
         """Get list of all accessible roll positions"""
         positions = []
@@ -79,35 +122,20 @@ class PaperGrid:
     def simulate_removal(self, visualize=False) -> int:
         """Simulate iterative removal of accessible rolls until none remain"""
         total_removed = 0
-        round_num = 0
 
         if visualize:
             print("Initial state:")
             self.print_grid()
 
-        while True:
-            # Find all currently accessible rolls
-            accessible = self.get_accessible_positions()
-
-            # If no more accessible rolls, we're done
-            if not accessible:
-                break
-
-            round_num += 1
-
-            if visualize:
-                print(f"Round {round_num}: Removing {len(accessible)} rolls (shown in red):")
-                self.print_grid(accessible)
-                input("Press Enter to continue...")
-
-            # Remove all accessible rolls
-            for row, col in accessible:
-                self.remove_roll(row, col)
-
+        for event in self.iter_removal_rounds():
             # Count how many we removed this round
-            total_removed += len(accessible)
+            total_removed += len(event.removed)
 
             if visualize:
+                removed = set(zip(*(axis.tolist() for axis in np.unravel_index(event.removed, self.grid.shape))))
+                print(f"Round {event.round_num}: Removing {len(removed)} rolls (shown in red):")
+                self.print_grid(removed)
+                input("Press Enter to continue...")
                 print(f"After removal:")
                 self.print_grid()
 
@@ -116,14 +144,262 @@ class PaperGrid:
 
         return total_removed
 
+    @staticmethod
+    def decrement_neighbors(counts: np.ndarray, removed: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """
+        Decrement the neighbor counts around the removed flat indices and return the
+        distinct cells that were touched. Sorting the neighbor indices and taking the
+        run lengths replaces np.unique and np.subtract.at, which are far slower here.
+        """
+        neighbors = (removed[:, None] + offsets).ravel()
+        neighbors.sort()
+        starts = np.flatnonzero(np.concatenate(([True], neighbors[1:] != neighbors[:-1])))
+        cells = neighbors[starts]
+        counts[cells] -= np.diff(np.append(starts, len(neighbors))).astype(counts.dtype)
+        return cells
+
+    def iter_removal_rounds(self):
+        """
+        Lazily yield a RemovalRound per round of the round-synchronous removal.
+        Only cells next to a removed roll are re-examined: a neighbor-count array
+        and the frontier of rolls accessible at the start of the round are kept,
+        removing a roll decrements its 8 neighbors, and the ones that drop below 4
+        form the next frontier. The round's rolls are already cleared from
+        self.grid when its event is yielded.
+        """
+        width = self.cols + 2
+        mask = np.pad(self.roll_mask(), 1)
+        counts = np.pad(self.neighbor_counts(mask[1:-1, 1:-1]), 1).astype(np.int8).ravel()
+        mask = mask.ravel()
+        offsets = np.array([dr * width + dc for dr, dc in self.directions])
+        flat_grid = self.grid.reshape(-1)
+
+        frontier = np.flatnonzero(mask & (counts < 4))
+        round_num = 0
+
+        while len(frontier):
+            round_num += 1
+            mask[frontier] = False
+
+            candidates = self.decrement_neighbors(counts, frontier, offsets)
+
+            # Padded flat index -> unpadded flat index
+            removed = ((frontier // width - 1) * self.cols + frontier % width - 1).astype(np.int32)
+            flat_grid[removed] = '.'
+            yield RemovalRound(round_num, removed)
+
+            frontier = candidates[mask[candidates] & (counts[candidates] < 4)]
+
+    def simulate_removal_worklist(self) -> tuple:
+        """
+        Same rounds and total as simulate_removal, driven by iter_removal_rounds.
+        Returns the total removed and a depth map holding the round each roll was
+        removed in (0 for rolls that stay).
+        """
+        depth = np.zeros(self.rows * self.cols, dtype=np.int32)
+        total_removed = 0
+        for event in self.iter_removal_rounds():
+            depth[event.removed] = event.round_num
+            total_removed += len(event.removed)
+        return total_removed, depth.reshape(self.rows, self.cols)
+
+    def accessible_counts_by_threshold(self, limits=range(1, 9)) -> dict:
+        """
+        part_one answer for every neighbor limit at once: rolls with fewer than
+        `limit` adjacent rolls, read off one histogram of the neighbor counts.
+        """
+        mask = self.roll_mask()
+        histogram = np.bincount(self.neighbor_counts(mask)[mask], minlength=9)
+        below = np.concatenate(([0], np.cumsum(histogram)))  # below[k] = rolls with fewer than k neighbors
+        return {limit: int(below[min(max(limit, 0), 9)]) for limit in limits}
+
+    def simulate_removal_thresholds(self, limits=range(1, 9)) -> dict:
+        """
+        part_two answer for several neighbor limits in one worklist pass.
+        The rolls left at the end for a limit are the largest set where every roll
+        has at least `limit` neighbors in the set, so the survivors of a higher limit
+        are a subset of those of a lower one. The limits are peeled in ascending order
+        on one shared mask and neighbor-count array, each picking up where the
+        previous one stopped, so every roll is removed at most once over all limits.
+        The grid itself isn't modified.
+        """
+        width = self.cols + 2
+        mask = np.pad(self.roll_mask(), 1).ravel()
+        counts = np.pad(self.neighbor_counts(mask.reshape(self.rows + 2, width)[1:-1, 1:-1]), 1)
+        counts = counts.astype(np.int8).ravel()
+        offsets = np.array([dr * width + dc for dr, dc in self.directions])
+
+        totals = {}
+        total_removed = 0
+        for limit in sorted(set(limits)):
+            frontier = np.flatnonzero(mask & (counts < limit))
+            while len(frontier):
+                mask[frontier] = False
+                total_removed += len(frontier)
+                candidates = self.decrement_neighbors(counts, frontier, offsets)
+                frontier = candidates[mask[candidates] & (counts[candidates] < limit)]
+            totals[limit] = total_removed
+
+        return {limit: totals[limit] for limit in limits}
+
+    def simulate_removal_tiled(self, tile_rows: int = 256, tile_cols: int = 256, workers: int = None) -> int:
+        """
+        Same total as simulate_removal with tiles of the grid processed in a process pool.
+        The padded roll mask lives in shared memory, so every tile reads its one-cell
+        halo straight from its neighbors; each worker attaches to it once, when the
+        pool starts. Each round runs in two phases separated by the pool barrier: all
+        tiles mark their accessible rolls, then all tiles remove them, so halos always
+        hold the state from the start of the round. Every worker gets one batch of
+        tiles per phase. Only tiles that had a removal, or that border one, can change
+        and are revisited.
+        """
+        shape = (self.rows + 2, self.cols + 2)
+        tiles = [(r0, min(r0 + tile_rows, self.rows), c0, min(c0 + tile_cols, self.cols))
+                 for r0 in range(0, self.rows, tile_rows) for c0 in range(0, self.cols, tile_cols)]
+        tiles_across = -(-self.cols // tile_cols) if self.cols else 1
+        tiles_down = len(tiles) // tiles_across
+
+        size = shape[0] * shape[1]
+        mask_shm = shared_memory.SharedMemory(create=True, size=size)
+        pending_shm = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            mask = np.ndarray(shape, dtype=np.uint8, buffer=mask_shm.buf)
+            mask[:] = np.pad(self.roll_mask(), 1)
+            np.ndarray(shape, dtype=np.uint8, buffer=pending_shm.buf)[:] = 0
+            names = (mask_shm.name, pending_shm.name)
+
+            total_removed = 0
+            active = list(range(len(tiles)))
+            workers = workers or os.cpu_count() or 1
+            with ProcessPoolExecutor(max_workers=workers, initializer=attach_tiles,
+                                     initargs=(names, shape)) as pool:
+                while active:
+                    # One strided batch of tiles per worker: a single task per worker per phase
+                    batches = [active[i::workers] for i in range(workers)]
+                    removed = {}
+                    for batch, counts in zip(batches, pool.map(mark_tiles, [[tiles[t] for t in batch]
+                                                                            for batch in batches])):
+                        removed.update(zip(batch, counts))
+                    changed = [t for t in active if removed[t]]
+                    list(pool.map(clear_tiles, [[tiles[t] for t in changed[i::workers]] for i in range(workers)]))
+                    total_removed += sum(removed.values())
+
+                    # Only a changed tile or its 8 neighbors can gain accessible rolls
+                    next_active = set()
+                    for t in changed:
+                        tile_row, tile_col = divmod(t, tiles_across)
+                        for dr in (-1, 0, 1):
+                            for dc in (-1, 0, 1):
+                                row, col = tile_row + dr, tile_col + dc
+                                if 0 <= row < tiles_down and 0 <= col < tiles_across:
+                                    next_active.add(row * tiles_across + col)
+                    active = sorted(next_active)
+
+            self.grid[mask[1:-1, 1:-1] == 0] = '.'
+            del mask
+            return total_removed
+        finally:
+            for shm in (mask_shm, pending_shm):
+                shm.close()
+                shm.unlink()
+
+
+
+class BitPackedGrid:
+    """Paper roll grid packed one bit per cell, with each row stored as a Python int"""
+
+    roll_bits = str.maketrans('@.', '10')
+
+    def __init__(self, grid: list):
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.full = (1 << self.cols) - 1
+        # Bit c of a row is column c, so the string is reversed before parsing
+        self.bits = [int(row.translate(self.roll_bits)[::-1] or '0', 2) for row in grid]
+
+    @staticmethod
+    def full_adder(a: int, b: int, c: int) -> tuple:
+        """Bitwise full adder: (sum bits, carry bits)"""
+        partial = a ^ b
+        return partial ^ c, (a & b) | (c & partial)
+
+    def accessible_row(self, above: int, row: int, below: int) -> int:
+        """
+        Bits of the rolls in `row` with fewer than 4 neighbors.
+        The 8 neighbor bitboards go through a carry-save adder tree; the count
+        reaches 4 exactly when one of the two weight-4 carries is set.
+        """
+        full = self.full
+        ones_a, twos_a = self.full_adder((above << 1) & full, above, above >> 1)
+        ones_b, twos_b = self.full_adder((below << 1) & full, below, below >> 1)
+        left, right = (row << 1) & full, row >> 1
+        ones_c, twos_c = left ^ right, left & right
+
+        _, twos_d = self.full_adder(ones_a, ones_b, ones_c)
+        twos, fours_a = self.full_adder(twos_a, twos_b, twos_c)
+        fours_b = twos & twos_d
+        return row & ~(fours_a | fours_b)
+
+    def accessible_rows(self) -> list:
+        """Accessible roll bits for every row"""
+        padded = [0] + self.bits + [0]
+        return [self.accessible_row(padded[r], padded[r + 1], padded[r + 2]) for r in range(self.rows)]
+
+    def count_accessible_rolls(self) -> int:
+        """Same count as PaperGrid.count_accessible_rolls"""
+        return sum(row.bit_count() for row in self.accessible_rows())
+
+    def simulate_removal(self) -> int:
+        """Round-synchronous removal like PaperGrid.simulate_removal, 64 cells per machine word"""
+        total_removed = 0
+        while True:
+            accessible = self.accessible_rows()
+            removed = sum(row.bit_count() for row in accessible)
+            if not removed:
+                return total_removed
+            self.bits = [row & ~taken for row, taken in zip(self.bits, accessible)]
+            total_removed += removed
+
+
+tile_arrays = {}
+
+
+def attach_tiles(names: tuple, shape: tuple):
+    """Pool initializer: attach each worker to the shared mask and pending arrays once"""
+    segments = [shared_memory.SharedMemory(name=name) for name in names]
+    tile_arrays['segments'] = segments
+    tile_arrays['mask'], tile_arrays['pending'] = (np.ndarray(shape, dtype=np.uint8, buffer=segment.buf)
+                                                   for segment in segments)
+
+
+def mark_tiles(tiles: list) -> list:
+    """Mark the accessible rolls of each tile as pending and return how many each one has"""
+    removed = []
+    for r0, r1, c0, c1 in tiles:
+        mask = tile_arrays['mask'][r0:r1 + 2, c0:c1 + 2]
+        pending = tile_arrays['pending'][r0 + 1:r1 + 1, c0 + 1:c1 + 1]
+        np.less(PaperGrid.neighbor_counts_padded(mask), 4, out=pending.view(bool))
+        pending &= mask[1:-1, 1:-1]
+        removed.append(int(np.count_nonzero(pending)))
+    return removed
+
+
+def clear_tiles(tiles: list):
+    """Remove the pending rolls of each tile from the shared mask"""
+    for r0, r1, c0, c1 in tiles:
+        pending = tile_arrays['pending'][r0 + 1:r1 + 1, c0 + 1:c1 + 1]
+        tile_arrays['mask'][r0 + 1:r1 + 1, c0 + 1:c1 + 1] &= pending ^ 1
+        pending[:] = 0
+
 
 def part_one(grid: list) -> int:
     paper_grid = PaperGrid(grid)
-    return paper_grid.count_accessible_rolls()
+    return paper_grid.count_accessible_rolls_vectorized()
 
 def part_two(grid: list) -> int:
     paper_grid = PaperGrid(grid)
-    return paper_grid.simulate_removal()
+    total_removed, _ = paper_grid.simulate_removal_worklist()
+    return total_removed
 
 def day_four():
     file_name = "../input/day_04.txt"
@@ -135,6 +411,12 @@ def day_four():
     part_one_solution = part_one(grid)
     part_two_solution = part_two(grid)
 
+    assert BitPackedGrid(grid).count_accessible_rolls() == part_one_solution
+    assert BitPackedGrid(grid).simulate_removal() == part_two_solution
+    assert PaperGrid(grid).accessible_counts_by_threshold()[4] == part_one_solution
+    assert PaperGrid(grid).simulate_removal_thresholds()[4] == part_two_solution
+    assert PaperGrid(grid).simulate_removal_tiled(tile_rows=32, tile_cols=32, workers=4) == part_two_solution
+
     print(f"Part 1: {part_one_solution}")
     print(f"Part 2: {part_two_solution}")
 